@@ -0,0 +1,39 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import argparse
+import json
+import time
+
+# ----------------------------------------------------------
+#   STUB ALERT WEBHOOK RECEIVER
+# ----------------------------------------------------------
+# Local stand-in for a slow or flaky webhook receiver. Point the dashboard at
+# it with AGV_ALERT_WEBHOOK_URL=http://127.0.0.1:9000/ and check that the
+# simulation keeps ticking every second while deliveries lag or fail.
+
+class StubReceiver(BaseHTTPRequestHandler):
+    latency = 0.0
+    status = 200
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(self.latency)
+        events = json.loads(body or b"{}").get("events", [])
+        print(f"Received {len(events)} events, replying {self.status} after {self.latency}s")
+        self.send_response(self.status)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stub alert webhook receiver")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before replying")
+    parser.add_argument("--status", type=int, default=200, help="HTTP status to reply with")
+    args = parser.parse_args()
+
+    StubReceiver.latency = args.latency
+    StubReceiver.status = args.status
+    print(f"Stub alert receiver on http://127.0.0.1:{args.port}/ (latency {args.latency}s)")
+    ThreadingHTTPServer(("127.0.0.1", args.port), StubReceiver).serve_forever()
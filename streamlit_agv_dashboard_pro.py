@@ -1,10 +1,18 @@
-from flask import Flask, jsonify, render_template_string
+from flask import Flask, Response, jsonify, render_template_string, request
 import threading
 import time
 import random
 import math
+import struct
+import json
+import os
+import socket
+import urllib.request
+from collections import OrderedDict
 from datetime import datetime
 
+import numpy as np
+
 app = Flask(__name__)
 
 # ----------------------------------------------------------
@@ -22,14 +30,628 @@ tasks = ["Picking Order #123", "Moving to Zone A", "Returning to Base",
          "Inventory Scan", "Charging", "Package Delivery"]
 
 last_positions = {agv: (0, 0) for agv in agv_data.keys()}
+alert_flags = {agv: 0 for agv in agv_data.keys()}  # Active ALERT_* bits per AGV
 alert_message = "System Stable ✓ All AGVs operating normally."
 system_uptime = datetime.now()
 
+# ----------------------------------------------------------
+#   TRAFFIC HEATMAP ACCUMULATION
+# ----------------------------------------------------------
+# Floor extent covered by the grid (matches the SVG mapping of the warehouse)
+HEATMAP_BOUNDS = (-10.0, 10.0, -10.0, 10.0)  # x_min, x_max, y_min, y_max
+HEATMAP_SHAPE = (40, 40)  # rows (y), cols (x)
+
+# Decaying windows are exponential with the given time constant in seconds;
+# "all" is the cumulative window since startup.
+HEATMAP_WINDOWS = {"1m": 60.0, "15m": 900.0, "1h": 3600.0, "all": None}
+HEATMAP_DEFAULT_WINDOW = "15m"
+
+# Mean speed is quantized against this fixed scale (the high-speed alert
+# threshold) so colours are comparable between snapshots.
+HEATMAP_SPEED_MAX = 3.5
+
+# Binary layout: header, then occupancy (relative to occ_max) and mean speed
+# (relative to speed_max) planes as uint8, row-major with row 0 at y_min.
+HEATMAP_HEADER = struct.Struct("<4sHH6f")
+HEATMAP_MAGIC = b"AGVH"
+
+
+class TrafficHeatmap:
+    """Occupancy and speed grids accumulated over the warehouse floor.
+
+    Each tick bins the fleet once and adds into every window. Decaying
+    windows store samples scaled by exp(t / tau) relative to a reference time
+    so no per-tick pass over the grid is needed; the decay is applied when the
+    grid is read, and the reference is rebased before the scale overflows.
+    """
+
+    REBASE_EXPONENT = 50.0
+
+    def __init__(self, bounds=HEATMAP_BOUNDS, shape=HEATMAP_SHAPE, windows=HEATMAP_WINDOWS):
+        self.bounds = bounds
+        self.shape = shape
+        self.windows = dict(windows)
+        self.lock = threading.Lock()
+        start = time.monotonic()
+        cells = shape[0] * shape[1]
+        self.occupancy = {name: np.zeros(cells) for name in self.windows}
+        self.speed = {name: np.zeros(cells) for name in self.windows}
+        self.reference = {name: start for name in self.windows}
+
+    def _bin(self, xs, ys):
+        """Map floor coordinates to flat cell indices"""
+        x_min, x_max, y_min, y_max = self.bounds
+        rows, cols = self.shape
+        ix = ((xs - x_min) * (cols / (x_max - x_min))).astype(np.intp)
+        iy = ((ys - y_min) * (rows / (y_max - y_min))).astype(np.intp)
+        np.clip(ix, 0, cols - 1, out=ix)
+        np.clip(iy, 0, rows - 1, out=iy)
+        return iy * cols + ix
+
+    def _rebase(self, name, now):
+        tau = self.windows[name]
+        factor = math.exp(-(now - self.reference[name]) / tau)
+        self.occupancy[name] *= factor
+        self.speed[name] *= factor
+        self.reference[name] = now
+
+    def accumulate(self, xs, ys, speeds, dt, now=None):
+        """Add one tick of fleet positions, weighted by the tick length"""
+        now = time.monotonic() if now is None else now
+        cells = self._bin(np.asarray(xs, dtype=float), np.asarray(ys, dtype=float))
+        speeds = np.asarray(speeds, dtype=float)
+
+        with self.lock:
+            for name, tau in self.windows.items():
+                weight = dt
+                if tau is not None:
+                    exponent = (now - self.reference[name]) / tau
+                    if exponent > self.REBASE_EXPONENT:
+                        self._rebase(name, now)
+                        exponent = 0.0
+                    weight = dt * math.exp(exponent)
+                np.add.at(self.occupancy[name], cells, weight)
+                np.add.at(self.speed[name], cells, speeds * weight)
+
+    def snapshot(self, window, now=None):
+        """Return (occupancy in AGV-seconds, mean speed) grids for a window"""
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            occupancy = self.occupancy[window].copy()
+            speed = self.speed[window].copy()
+            reference = self.reference[window]
+
+        # The speed/occupancy ratio is independent of the decay scale
+        mean_speed = np.divide(speed, occupancy, out=np.zeros_like(speed), where=occupancy > 0)
+        tau = self.windows[window]
+        if tau is not None:
+            occupancy *= math.exp(-(now - reference) / tau)
+        return occupancy.reshape(self.shape), mean_speed.reshape(self.shape)
+
+    def encode(self, window, now=None):
+        """Pack a window into the compact binary grid format"""
+        occupancy, mean_speed = self.snapshot(window, now)
+        occ_max = float(occupancy.max())
+        speed_max = HEATMAP_SPEED_MAX
+        occ_q = np.zeros(occupancy.shape, dtype=np.uint8)
+        if occ_max > 0:
+            occ_q[:] = np.rint(occupancy * (255.0 / occ_max))
+        speed_q = np.rint(np.clip(mean_speed / speed_max, 0.0, 1.0) * 255.0).astype(np.uint8)
+
+        rows, cols = self.shape
+        header = HEATMAP_HEADER.pack(HEATMAP_MAGIC, cols, rows, *self.bounds, occ_max, speed_max)
+        return header + occ_q.tobytes() + speed_q.tobytes()
+
+
+traffic_heatmap = TrafficHeatmap()
+
+# ----------------------------------------------------------
+#   STREAMING FLEET KPIs
+# ----------------------------------------------------------
+ALERT_AVOIDING = 1
+ALERT_LOW_BATTERY = 2
+ALERT_CRITICAL_BATTERY = 4
+ALERT_HIGH_SPEED = 8
+
+ALERT_NAMES = {
+    ALERT_AVOIDING: "collision_avoidance",
+    ALERT_LOW_BATTERY: "low_battery",
+    ALERT_CRITICAL_BATTERY: "critical_battery",
+    ALERT_HIGH_SPEED: "high_speed"
+}
+
+STATUS_INDEX = {status: i for i, status in enumerate(statuses)}
+UTILIZED_STATUSES = ["moving", "avoiding", "loading"]
+
+KPI_WINDOWS = {"1h": 3600.0, "8h": 8 * 3600.0, "24h": 24 * 3600.0}
+KPI_WINDOW_BUCKETS = 60
+
+
+class SlidingWindowCounter:
+    """Rolling sums over a time window kept in a ring of fixed-width buckets.
+
+    Adding is O(1) into the current bucket and the running total. When the
+    ring advances the total is rebuilt from the buckets, which costs
+    O(buckets) once per bucket length and keeps floating-point error from
+    accumulating in the total.
+    """
+
+    def __init__(self, window, width, buckets=KPI_WINDOW_BUCKETS, now=None):
+        self.bucket_length = window / buckets
+        self.ring = np.zeros((buckets, width))
+        self.total = np.zeros(width)
+        self.index = 0
+        self.bucket_start = time.monotonic() if now is None else now
+
+    def _advance(self, now):
+        elapsed = int((now - self.bucket_start) // self.bucket_length)
+        if elapsed <= 0:
+            return
+        if elapsed >= len(self.ring):
+            self.ring[:] = 0
+            self.total[:] = 0
+            self.index = (self.index + elapsed) % len(self.ring)
+        else:
+            for _ in range(elapsed):
+                self.index = (self.index + 1) % len(self.ring)
+                self.ring[self.index] = 0
+            self.ring.sum(axis=0, out=self.total)
+        self.bucket_start += elapsed * self.bucket_length
+
+    def add(self, values, now):
+        self._advance(now)
+        self.ring[self.index] += values
+        self.total += values
+
+    def sums(self, now):
+        self._advance(now)
+        return self.total.copy()
+
+
+class FleetKPIs:
+    """Per-AGV and fleet utilization, odometer, status time and alert counts.
+
+    Figures are cumulative since startup. Fleet figures and per-AGV alert
+    counts are also kept over the rolling KPI_WINDOWS. Each tick is a
+    handful of vectorized array updates, independent of how long the
+    simulation has been running.
+    """
+
+    # Columns of the rolling window counters
+    COL_SECONDS = 0
+    COL_STATUS = 1
+    COL_DISTANCE = COL_STATUS + len(statuses)
+    COL_ALERTS = COL_DISTANCE + 1
+    COL_AGV_ALERTS = COL_ALERTS + 1  # One column per AGV from here on
+
+    def __init__(self, agv_names, windows=KPI_WINDOWS, now=None):
+        now = time.monotonic() if now is None else now
+        self.agv_names = list(agv_names)
+        self.lock = threading.Lock()
+        self.tracked_seconds = 0.0  # Sum of tick dt, not process uptime
+        self.status_seconds = np.zeros((len(self.agv_names), len(statuses)))
+        self.distance = np.zeros(len(self.agv_names))
+        self.alerts = np.zeros(len(self.agv_names), dtype=np.int64)
+        self.utilized = np.array([STATUS_INDEX[s] for s in UTILIZED_STATUSES])
+        self.windows = {
+            name: SlidingWindowCounter(length, self.COL_AGV_ALERTS + len(self.agv_names), now=now)
+            for name, length in windows.items()
+        }
+        self._rows = np.arange(len(self.agv_names))
+
+    def update(self, status_index, distance, alert_onsets, dt, now=None):
+        """Record one tick; arrays are ordered like agv_names"""
+        now = time.monotonic() if now is None else now
+        status_index = np.asarray(status_index, dtype=np.intp)
+        distance = np.asarray(distance, dtype=float)
+        alert_onsets = np.asarray(alert_onsets, dtype=np.int64)
+
+        tick = np.empty(self.COL_AGV_ALERTS + len(self.agv_names))
+        tick[self.COL_SECONDS] = dt
+        tick[self.COL_STATUS:self.COL_DISTANCE] = np.bincount(status_index, minlength=len(statuses)) * dt
+        tick[self.COL_DISTANCE] = distance.sum()
+        tick[self.COL_ALERTS] = alert_onsets.sum()
+        tick[self.COL_AGV_ALERTS:] = alert_onsets
+
+        with self.lock:
+            self.tracked_seconds += dt
+            self.status_seconds[self._rows, status_index] += dt
+            self.distance += distance
+            self.alerts += alert_onsets
+            for counter in self.windows.values():
+                counter.add(tick, now)
+
+    def _utilization(self, status_seconds):
+        total = status_seconds.sum(axis=-1)
+        busy = status_seconds[..., self.utilized].sum(axis=-1)
+        return np.divide(busy * 100.0, total, out=np.zeros_like(total), where=total > 0)
+
+    def report(self, now=None):
+        """Summarize the KPIs as a JSON-serializable dict"""
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            tracked_seconds = self.tracked_seconds
+            status_seconds = self.status_seconds.copy()
+            distance = self.distance.copy()
+            alerts = self.alerts.copy()
+            window_sums = {name: counter.sums(now) for name, counter in self.windows.items()}
+
+        utilization = self._utilization(status_seconds)
+        agv_windows = {}
+        for name, sums in window_sums.items():
+            covered = sums[self.COL_SECONDS]
+            counts = np.rint(sums[self.COL_AGV_ALERTS:]).astype(np.int64)
+            rates = counts * (3600.0 / covered) if covered > 0 else np.zeros(len(counts))
+            agv_windows[name] = (counts, rates)
+
+        agvs = {}
+        for i, agv in enumerate(self.agv_names):
+            agvs[agv] = {
+                "utilization_pct": round(float(utilization[i]), 1),
+                "distance": round(float(distance[i]), 2),
+                "status_seconds": {s: round(float(status_seconds[i, j]), 1) for j, s in enumerate(statuses)},
+                "alerts": int(alerts[i]),
+                "windows": {
+                    name: {"alerts": int(counts[i]), "alerts_per_hour": round(float(rates[i]), 2)}
+                    for name, (counts, rates) in agv_windows.items()
+                }
+            }
+
+        fleet_status = status_seconds.sum(axis=0)
+        windows = {}
+        for name, sums in window_sums.items():
+            covered = sums[self.COL_SECONDS]
+            window_status = sums[self.COL_STATUS:self.COL_DISTANCE]
+            windows[name] = {
+                "covered_seconds": round(float(covered), 1),
+                "utilization_pct": round(float(self._utilization(window_status)), 1),
+                "distance": round(float(sums[self.COL_DISTANCE]), 2),
+                "status_seconds": {s: round(float(window_status[j]), 1) for j, s in enumerate(statuses)},
+                "alerts": int(round(sums[self.COL_ALERTS])),
+                "alerts_per_hour": round(float(sums[self.COL_ALERTS] * 3600.0 / covered), 2) if covered > 0 else 0.0
+            }
+
+        return {
+            "fleet": {
+                "tracked_seconds": round(tracked_seconds, 1),
+                "utilization_pct": round(float(self._utilization(fleet_status)), 1),
+                "distance": round(float(distance.sum()), 2),
+                "status_seconds": {s: round(float(fleet_status[j]), 1) for j, s in enumerate(statuses)},
+                "alerts": int(alerts.sum()),
+                "windows": windows
+            },
+            "agvs": agvs
+        }
+
+
+fleet_kpis = FleetKPIs(agv_data.keys())
+
+# ----------------------------------------------------------
+#   OUTBOUND ALERT EVENT DELIVERY
+# ----------------------------------------------------------
+class AlertSink:
+    """Delivers alert events in batches from its own background thread.
+
+    publish() never blocks the caller: events wait in a bounded buffer keyed
+    by (AGV, alert). Events are state transitions, so a second event for a
+    pending key is a flap; the two are merged into one event carrying the
+    latest state, the first raise (raised_at), the last clear (cleared_at)
+    and the number of merged transitions (flaps), so a short-lived raise is
+    never lost. Every delivered event has these fields.
+
+    When the buffer is full new events are dropped and counted. Failed
+    batches are retried with exponential backoff and dropped once the
+    retries run out. Subclasses implement deliver().
+    """
+
+    def __init__(self, name, max_pending=1000, batch_size=50, batch_interval=0.5,
+                 max_retries=5, backoff=0.5, max_backoff=30.0):
+        self.name = name
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.pending = OrderedDict()
+        self.condition = threading.Condition()
+        self.running = False
+        self.stats = {"published": 0, "coalesced": 0, "delivered": 0,
+                      "dropped": 0, "retries": 0, "failed_batches": 0}
+        self.thread = threading.Thread(target=self._run, name=f"alert-sink-{name}", daemon=True)
+
+    def start(self):
+        self.running = True
+        self.thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        self.thread.join(timeout)
+
+    def publish(self, event):
+        """Queue an event for delivery without blocking"""
+        key = (event["agv"], event["alert"])
+        with self.condition:
+            self.stats["published"] += 1
+            if key in self.pending:
+                self.pending[key] = self._merge(self.pending[key], event)
+                self.stats["coalesced"] += 1
+                return
+            if len(self.pending) >= self.max_pending:
+                self.stats["dropped"] += 1
+                return
+            # Every event carries the merge fields, merged or not
+            self.pending[key] = dict(
+                event,
+                raised_at=event["timestamp"] if event["state"] == "raised" else None,
+                cleared_at=event["timestamp"] if event["state"] == "cleared" else None,
+                flaps=0
+            )
+            self.condition.notify()
+
+    @staticmethod
+    def _merge(pending, event):
+        merged = dict(event)
+        merged["raised_at"] = pending["raised_at"]
+        merged["cleared_at"] = pending["cleared_at"]
+        if event["state"] == "raised":
+            merged["raised_at"] = pending["raised_at"] or event["timestamp"]
+        else:
+            merged["cleared_at"] = event["timestamp"]
+        merged["flaps"] = pending["flaps"] + 1
+        return merged
+
+    def _next_batch(self):
+        with self.condition:
+            while self.running and not self.pending:
+                self.condition.wait()
+            if not self.pending:
+                return None
+        # Let more events collect (and coalesce) before sending
+        time.sleep(self.batch_interval)
+        with self.condition:
+            count = min(self.batch_size, len(self.pending))
+            return [self.pending.popitem(last=False)[1] for _ in range(count)]
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            for attempt in range(self.max_retries + 1):
+                try:
+                    self.deliver(batch)
+                except Exception as exc:
+                    if attempt == self.max_retries or not self.running:
+                        app.logger.warning("Alert sink %s: dropping %d events (%s)", self.name, len(batch), exc)
+                        with self.condition:
+                            self.stats["failed_batches"] += 1
+                            self.stats["dropped"] += len(batch)
+                        break
+                    with self.condition:
+                        self.stats["retries"] += 1
+                    time.sleep(min(self.backoff * 2 ** attempt, self.max_backoff))
+                else:
+                    with self.condition:
+                        self.stats["delivered"] += len(batch)
+                    break
+
+    def get_stats(self):
+        with self.condition:
+            stats = dict(self.stats)
+            stats["pending"] = len(self.pending)
+        return stats
+
+    def deliver(self, batch):
+        raise NotImplementedError
+
+
+class WebhookSink(AlertSink):
+    """POSTs each batch as {"events": [...]} JSON to an HTTP endpoint"""
+
+    def __init__(self, url, timeout=5.0, **kwargs):
+        super().__init__("webhook", **kwargs)
+        self.url = url
+        self.timeout = timeout
+
+    def deliver(self, batch):
+        body = json.dumps({"events": batch}).encode("utf-8")
+        req = urllib.request.Request(self.url, data=body, method="POST",
+                                     headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(req, timeout=self.timeout) as response:
+            response.read()
+
+
+class JSONLSink(AlertSink):
+    """Appends one JSON object per event to a file"""
+
+    def __init__(self, path, **kwargs):
+        super().__init__("jsonl", **kwargs)
+        self.path = path
+
+    def deliver(self, batch):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(event) + "\n" for event in batch))
+
+
+class SocketSink(AlertSink):
+    """Streams newline-delimited JSON events over a TCP connection.
+
+    Delivery is best-effort: a peer that has closed is detected before each
+    write and the batch retried on a new connection, but data the peer drops
+    after a successful send is still counted as delivered.
+    """
+
+    def __init__(self, host, port, timeout=5.0, **kwargs):
+        super().__init__("socket", **kwargs)
+        self.address = (host, port)
+        self.timeout = timeout
+        self.connection = None
+
+    def deliver(self, batch):
+        data = "".join(json.dumps(event) + "\n" for event in batch).encode("utf-8")
+        try:
+            if self.connection is not None and self._peer_closed():
+                raise ConnectionResetError("peer closed the connection")
+            if self.connection is None:
+                self.connection = socket.create_connection(self.address, timeout=self.timeout)
+            self.connection.sendall(data)
+        except OSError:
+            # Reconnect on the next attempt
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+            raise
+
+    def _peer_closed(self):
+        # A readable socket with no data means the peer sent FIN
+        self.connection.setblocking(False)
+        try:
+            return self.connection.recv(1, socket.MSG_PEEK) == b""
+        except BlockingIOError:
+            return False
+        finally:
+            self.connection.settimeout(self.timeout)
+
+
+def configure_alert_sinks():
+    """Create alert sinks from the AGV_ALERT_* environment variables"""
+    sinks = []
+    if os.environ.get("AGV_ALERT_WEBHOOK_URL"):
+        sinks.append(WebhookSink(os.environ["AGV_ALERT_WEBHOOK_URL"]))
+    if os.environ.get("AGV_ALERT_JSONL_PATH"):
+        sinks.append(JSONLSink(os.environ["AGV_ALERT_JSONL_PATH"]))
+    if os.environ.get("AGV_ALERT_SOCKET"):
+        host, _, port = os.environ["AGV_ALERT_SOCKET"].rpartition(":")
+        sinks.append(SocketSink(host or "127.0.0.1", int(port)))
+    return sinks
+
+
+def publish_alert_transitions(agv, raised, cleared):
+    """Send raised/cleared events for the changed ALERT_* bits to every sink"""
+    for flag, alert in ALERT_NAMES.items():
+        if flag & raised:
+            state = "raised"
+        elif flag & cleared:
+            state = "cleared"
+        else:
+            continue
+        for sink in alert_sinks:
+            sink.publish({
+                "agv": agv,
+                "alert": alert,
+                "state": state,
+                "status": agv_data[agv]["status"],
+                "battery": round(agv_data[agv]["battery"], 1),
+                "speed": agv_data[agv]["speed"],
+                "timestamp": datetime.now().isoformat()
+            })
+
+
+alert_sinks = []
+
 # ----------------------------------------------------------
 #   ENHANCED BACKGROUND AGV SIMULATION
 # ----------------------------------------------------------
-def update_fake_data():
+def tick(dt, now=None):
+    """Advance the simulation by one step covering dt seconds"""
     global alert_message
+    now = time.monotonic() if now is None else now
+    alerts = []
+    tick_status = []
+    tick_distance = []
+    tick_alert_onsets = []
+    
+    for agv in agv_data:
+        prev_x, prev_y = last_positions[agv]
+        
+        # Simulate more realistic movement with inertia
+        move_x = random.uniform(-1.5, 1.5) * 0.7 + (agv_data[agv]["x"] - prev_x) * 0.3
+        move_y = random.uniform(-1.5, 1.5) * 0.7 + (agv_data[agv]["y"] - prev_y) * 0.3
+        
+        new_x = round(agv_data[agv]["x"] + move_x, 2)
+        new_y = round(agv_data[agv]["y"] + move_y, 2)
+        
+        # Keep within bounds
+        new_x = max(-8, min(8, new_x))
+        new_y = max(-8, min(8, new_y))
+        
+        agv_data[agv]["x"] = new_x
+        agv_data[agv]["y"] = new_y
+        
+        # Calculate speed based on distance moved
+        dist = math.hypot(new_x - prev_x, new_y - prev_y)
+        agv_data[agv]["speed"] = round(dist * 2.0, 2)
+        last_positions[agv] = (new_x, new_y)
+        
+        # Status updates with state persistence
+        if random.random() < 0.1:  # 10% chance to change status
+            agv_data[agv]["status"] = random.choice(statuses)
+            if agv_data[agv]["status"] in ["moving", "loading"]:
+                agv_data[agv]["task"] = random.choice(tasks)
+        
+        # Battery simulation with different drain rates
+        if agv_data[agv]["status"] == "moving":
+            drain = random.uniform(0.3, 1.0)
+        elif agv_data[agv]["status"] == "charging":
+            drain = -random.uniform(1.0, 2.0)  # Charging
+        else:
+            drain = random.uniform(0.1, 0.3)
+        
+        agv_data[agv]["battery"] = max(0, min(100, agv_data[agv]["battery"] - drain))
+        
+        # Generate alerts
+        active = 0
+        if agv_data[agv]["status"] == "avoiding":
+            alerts.append(f"⚠️ {agv}: Collision avoidance active")
+            active |= ALERT_AVOIDING
+        if agv_data[agv]["battery"] < 15:
+            alerts.append(f"🔋 {agv}: Low battery ({agv_data[agv]['battery']:.1f}%)")
+            active |= ALERT_LOW_BATTERY
+        if agv_data[agv]["battery"] < 5:
+            alerts.append(f"🚨 {agv}: CRITICAL battery level!")
+            active |= ALERT_CRITICAL_BATTERY
+        if agv_data[agv]["speed"] > 3.5:
+            alerts.append(f"⚡ {agv}: High speed ({agv_data[agv]['speed']} m/s)")
+            active |= ALERT_HIGH_SPEED
+        
+        # Count alerts when they are raised, not for every tick they stay active
+        raised = active & ~alert_flags[agv]
+        cleared = alert_flags[agv] & ~active
+        alert_flags[agv] = active
+        if alert_sinks and (raised or cleared):
+            publish_alert_transitions(agv, raised, cleared)
+        
+        tick_status.append(STATUS_INDEX[agv_data[agv]["status"]])
+        tick_distance.append(dist)
+        tick_alert_onsets.append(bin(raised).count("1"))
+    
+    fleet_kpis.update(tick_status, tick_distance, tick_alert_onsets, dt, now)
+    
+    # Accumulate traffic heatmap (one binning pass over the fleet)
+    fleet = agv_data.values()
+    traffic_heatmap.accumulate(
+        np.fromiter((d["x"] for d in fleet), dtype=float, count=len(agv_data)),
+        np.fromiter((d["y"] for d in fleet), dtype=float, count=len(agv_data)),
+        np.fromiter((d["speed"] for d in fleet), dtype=float, count=len(agv_data)),
+        dt,
+        now,
+    )
+    
+    # Update global alert message
+    if alerts:
+        alert_message = " | ".join(alerts[:3])  # Show up to 3 alerts
+    else:
+        uptime = datetime.now() - system_uptime
+        hours = uptime.seconds // 3600
+        minutes = (uptime.seconds % 3600) // 60
+        alert_message = f"✓ System Normal | Uptime: {hours}h {minutes}m"
+
+def update_fake_data():
+    """Run the simulation loop, one tick per second"""
     
     # Initialize with different starting positions
     base_positions = {
@@ -44,66 +666,12 @@ def update_fake_data():
         agv_data[agv]["y"] = pos[1]
         last_positions[agv] = pos
 
+    last_tick = time.monotonic()
+
     while True:
-        alerts = []
-        
-        for agv in agv_data:
-            prev_x, prev_y = last_positions[agv]
-            
-            # Simulate more realistic movement with inertia
-            move_x = random.uniform(-1.5, 1.5) * 0.7 + (agv_data[agv]["x"] - prev_x) * 0.3
-            move_y = random.uniform(-1.5, 1.5) * 0.7 + (agv_data[agv]["y"] - prev_y) * 0.3
-            
-            new_x = round(agv_data[agv]["x"] + move_x, 2)
-            new_y = round(agv_data[agv]["y"] + move_y, 2)
-            
-            # Keep within bounds
-            new_x = max(-8, min(8, new_x))
-            new_y = max(-8, min(8, new_y))
-            
-            agv_data[agv]["x"] = new_x
-            agv_data[agv]["y"] = new_y
-            
-            # Calculate speed based on distance moved
-            dist = math.hypot(new_x - prev_x, new_y - prev_y)
-            agv_data[agv]["speed"] = round(dist * 2.0, 2)
-            last_positions[agv] = (new_x, new_y)
-            
-            # Status updates with state persistence
-            if random.random() < 0.1:  # 10% chance to change status
-                agv_data[agv]["status"] = random.choice(statuses)
-                if agv_data[agv]["status"] in ["moving", "loading"]:
-                    agv_data[agv]["task"] = random.choice(tasks)
-            
-            # Battery simulation with different drain rates
-            if agv_data[agv]["status"] == "moving":
-                drain = random.uniform(0.3, 1.0)
-            elif agv_data[agv]["status"] == "charging":
-                drain = -random.uniform(1.0, 2.0)  # Charging
-            else:
-                drain = random.uniform(0.1, 0.3)
-            
-            agv_data[agv]["battery"] = max(0, min(100, agv_data[agv]["battery"] - drain))
-            
-            # Generate alerts
-            if agv_data[agv]["status"] == "avoiding":
-                alerts.append(f"⚠️ {agv}: Collision avoidance active")
-            if agv_data[agv]["battery"] < 15:
-                alerts.append(f"🔋 {agv}: Low battery ({agv_data[agv]['battery']:.1f}%)")
-            if agv_data[agv]["battery"] < 5:
-                alerts.append(f"🚨 {agv}: CRITICAL battery level!")
-            if agv_data[agv]["speed"] > 3.5:
-                alerts.append(f"⚡ {agv}: High speed ({agv_data[agv]['speed']} m/s)")
-        
-        # Update global alert message
-        if alerts:
-            alert_message = " | ".join(alerts[:3])  # Show up to 3 alerts
-        else:
-            uptime = datetime.now() - system_uptime
-            hours = uptime.seconds // 3600
-            minutes = (uptime.seconds % 3600) // 60
-            alert_message = f"✓ System Normal | Uptime: {hours}h {minutes}m"
-        
+        now = time.monotonic()
+        tick(now - last_tick, now)
+        last_tick = now
         time.sleep(1.0)  # Update every second
 
 # ----------------------------------------------------------
@@ -315,6 +883,23 @@ def dashboard():
         stroke-width: 2;
     }
     
+    .heatmap-controls {
+        display: flex;
+        justify-content: flex-end;
+        align-items: center;
+        gap: 10px;
+        margin-bottom: 10px;
+        font-size: 0.9rem;
+    }
+    
+    .heatmap-controls select {
+        background: var(--card-bg);
+        color: white;
+        border: 1px solid var(--accent);
+        border-radius: 5px;
+        padding: 4px 8px;
+    }
+    
     .agv-robot {
         transition: transform 0.5s ease;
     }
@@ -379,6 +964,16 @@ def dashboard():
     </h2>
     
     <div id="warehousePanel">
+        <div class="heatmap-controls">
+            <label for="heatmapWindow"><i class="fas fa-fire"></i> Traffic heatmap</label>
+            <select id="heatmapWindow">
+                <option value="off">Off</option>
+                <option value="1m">Last minute</option>
+                <option value="15m" selected>Last 15 minutes</option>
+                <option value="1h">Last hour</option>
+                <option value="all">Since startup</option>
+            </select>
+        </div>
         <svg id="warehouseSVG" viewBox="0 0 1000 600">
             <!-- Warehouse floor -->
             <rect width="100%" height="100%" fill="#0f355f"/>
@@ -402,6 +997,9 @@ def dashboard():
             <text x="80" y="520" fill="white" text-anchor="middle" font-size="12">Charging</text>
             <text x="920" y="520" fill="white" text-anchor="middle" font-size="12">Charging</text>
             
+            <!-- Traffic heatmap overlay (opacity = occupancy, red = slow) -->
+            <g id="heatmapLayer"></g>
+            
             <!-- AGV robots will be placed here -->
             <g id="agvMarkers"></g>
             
@@ -648,11 +1246,88 @@ function updateWarehouse(data) {
     });
 }
 
+async function loadHeatmap() {
+    const windowName = document.getElementById('heatmapWindow').value;
+    const layer = document.getElementById('heatmapLayer');
+    
+    if (windowName === 'off') {
+        layer.style.display = 'none';
+        return;
+    }
+    layer.style.display = '';
+    
+    try {
+        const res = await fetch(`/heatmap?window=${windowName}`);
+        drawHeatmap(await res.arrayBuffer());
+    } catch (error) {
+        console.error('Error loading heatmap:', error);
+    }
+}
+
+function drawHeatmap(buffer) {
+    // Header: magic, cols, rows, x/y bounds, occupancy max, speed max
+    const view = new DataView(buffer);
+    const cols = view.getUint16(4, true);
+    const rows = view.getUint16(6, true);
+    const xMin = view.getFloat32(8, true);
+    const xMax = view.getFloat32(12, true);
+    const yMin = view.getFloat32(16, true);
+    const yMax = view.getFloat32(20, true);
+    const cells = rows * cols;
+    const occupancy = new Uint8Array(buffer, 32, cells);
+    const speed = new Uint8Array(buffer, 32 + cells, cells);
+    
+    // Same mapping as the AGV markers
+    const warehouseWidth = 800;
+    const warehouseHeight = 400;
+    const offsetX = 100;
+    const offsetY = 100;
+    const cellWidth = warehouseWidth / cols;
+    const cellHeight = warehouseHeight / rows;
+    
+    const svgNS = "http://www.w3.org/2000/svg";
+    const layer = document.getElementById("heatmapLayer");
+    
+    // Build the cell grid once, then only update fills
+    if (layer.childElementCount !== cells) {
+        while (layer.firstChild) {
+            layer.removeChild(layer.firstChild);
+        }
+        for (let row = 0; row < rows; row++) {
+            for (let col = 0; col < cols; col++) {
+                const cellTop = yMin + (row + 1) * (yMax - yMin) / rows;
+                const rect = document.createElementNS(svgNS, "rect");
+                rect.setAttribute("x", offsetX + col * cellWidth);
+                rect.setAttribute("y", offsetY + ((yMax - cellTop) / (yMax - yMin)) * warehouseHeight);
+                rect.setAttribute("width", cellWidth);
+                rect.setAttribute("height", cellHeight);
+                layer.appendChild(rect);
+            }
+        }
+    }
+    
+    for (let i = 0; i < cells; i++) {
+        const rect = layer.children[i];
+        if (occupancy[i] === 0) {
+            rect.setAttribute("fill-opacity", 0);
+            continue;
+        }
+        // Speed is on a fixed scale (255 = header speed_max m/s): slow traffic shows
+        // red, traffic at the high-speed threshold green
+        const hue = Math.round((speed[i] / 255) * 120);
+        rect.setAttribute("fill", `hsl(${hue}, 100%, 50%)`);
+        rect.setAttribute("fill-opacity", (0.15 + 0.55 * occupancy[i] / 255).toFixed(2));
+    }
+}
+
 // Initial load
 loadData();
+loadHeatmap();
 
 // Auto-refresh every second
 setInterval(loadData, 1000);
+setInterval(loadHeatmap, 1000);
+document.getElementById('heatmapWindow').addEventListener('change', loadHeatmap);
 
 // Keyboard shortcuts
 document.addEventListener('keydown', (e) => {
@@ -695,10 +1370,37 @@ def get_status():
         "timestamp": datetime.now().isoformat()
     })
 
+@app.route("/heatmap")
+def get_heatmap():
+    """Return the traffic heatmap for a window as a compact binary grid"""
+    window = request.args.get("window", HEATMAP_DEFAULT_WINDOW)
+    if window not in HEATMAP_WINDOWS:
+        return jsonify({
+            "error": f"Unknown window '{window}'",
+            "windows": list(HEATMAP_WINDOWS)
+        }), 400
+    
+    return Response(traffic_heatmap.encode(window), mimetype="application/octet-stream")
+
+@app.route("/kpis")
+def get_kpis():
+    """Return utilization, distance, status time and alert rate KPIs"""
+    kpis = fleet_kpis.report()
+    kpis["timestamp"] = datetime.now().isoformat()
+    return jsonify(kpis)
+
+@app.route("/sinks")
+def get_sinks():
+    """Return delivery counters for the configured alert sinks"""
+    return jsonify({sink.name: sink.get_stats() for sink in alert_sinks})
+
 # ----------------------------------------------------------
 #   START BACKGROUND THREAD + FLASK
 # ----------------------------------------------------------
 if __name__ == "__main__":
+    # Start alert delivery before the simulation produces events
+    alert_sinks.extend(sink.start() for sink in configure_alert_sinks())
+    
     # Start simulation thread
     sim_thread = threading.Thread(target=update_fake_data, daemon=True)
     sim_thread.start()
@@ -711,6 +1413,9 @@ if __name__ == "__main__":
     print(f"Data API: http://127.0.0.1:5000/data")
     print(f"Alert API: http://127.0.0.1:5000/alert")
     print(f"Status API: http://127.0.0.1:5000/status")
+    print(f"KPI API: http://127.0.0.1:5000/kpis")
+    print(f"Alert sinks API: http://127.0.0.1:5000/sinks")
+    print(f"Heatmap API: http://127.0.0.1:5000/heatmap?window={HEATMAP_DEFAULT_WINDOW}")
     print("=" * 60)
     print("Press Ctrl+C to stop")
     
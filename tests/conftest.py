@@ -0,0 +1,22 @@
+import copy
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import streamlit_agv_dashboard_pro as dashboard
+
+
+@pytest.fixture
+def fresh_simulation(monkeypatch):
+    """Run tick() against fresh copies of the module's simulation state"""
+    monkeypatch.setattr(dashboard, "agv_data", copy.deepcopy(dashboard.agv_data))
+    monkeypatch.setattr(dashboard, "last_positions", dict(dashboard.last_positions))
+    monkeypatch.setattr(dashboard, "alert_flags", dict(dashboard.alert_flags))
+    monkeypatch.setattr(dashboard, "alert_message", dashboard.alert_message)
+    monkeypatch.setattr(dashboard, "alert_sinks", [])
+    monkeypatch.setattr(dashboard, "fleet_kpis", dashboard.FleetKPIs(dashboard.agv_data.keys()))
+    monkeypatch.setattr(dashboard, "traffic_heatmap", dashboard.TrafficHeatmap())
+    return dashboard
@@ -0,0 +1,167 @@
+import itertools
+import socket
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+from alert_stub_receiver import StubReceiver
+from streamlit_agv_dashboard_pro import AlertSink, SocketSink
+
+TICKS = 10
+MAX_TICK_SECONDS = 0.1
+
+
+class SlowReceiver(StubReceiver):
+    latency = 3.0
+
+
+class RecordingSink(AlertSink):
+    def __init__(self, **kwargs):
+        super().__init__("recording", batch_interval=0.0, **kwargs)
+        self.batches = []
+
+    def deliver(self, batch):
+        self.batches.append(batch)
+
+
+class FailingSink(AlertSink):
+    def __init__(self, **kwargs):
+        super().__init__("failing", batch_interval=0.0, backoff=0.0, **kwargs)
+
+    def deliver(self, batch):
+        raise ConnectionError("receiver unavailable")
+
+
+def event(agv, state, timestamp, alert="low_battery"):
+    return {"agv": agv, "alert": alert, "state": state, "timestamp": timestamp}
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def unused_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_slow_and_unreachable_sinks_do_not_stall_ticks(fresh_simulation, monkeypatch):
+    dashboard = fresh_simulation
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowReceiver)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    webhook = dashboard.WebhookSink(f"http://127.0.0.1:{server.server_port}/",
+                                    timeout=10.0, batch_interval=0.05).start()
+    unreachable = dashboard.SocketSink("127.0.0.1", unused_port(),
+                                       batch_interval=0.05, backoff=0.05, max_retries=1).start()
+    monkeypatch.setattr(dashboard, "alert_sinks", [webhook, unreachable])
+
+    # Flip every AGV between avoiding and moving so each tick publishes events
+    flip = itertools.cycle(["avoiding"] * len(dashboard.agv_data) + ["moving"] * len(dashboard.agv_data))
+    monkeypatch.setattr(dashboard.random, "random", lambda: 0.0)
+    monkeypatch.setattr(dashboard.random, "choice",
+                        lambda seq: next(flip) if seq is dashboard.statuses else seq[0])
+
+    try:
+        durations = []
+        for _ in range(TICKS):
+            start = time.perf_counter()
+            dashboard.tick(0.1)
+            durations.append(time.perf_counter() - start)
+            time.sleep(0.1)
+        time.sleep(0.5)
+
+        # Every tick ran quickly while the first webhook request was blocked
+        assert len(durations) == TICKS
+        assert max(durations) < MAX_TICK_SECONDS
+        stats = dashboard.app.test_client().get("/sinks").get_json()
+        assert stats["webhook"]["delivered"] == 0
+        assert stats["webhook"]["coalesced"] > 0
+        assert stats["webhook"]["pending"] > 0
+        assert stats["socket"]["retries"] > 0
+        assert stats["socket"]["dropped"] > 0
+    finally:
+        server.shutdown()
+        webhook.stop(timeout=0)
+        unreachable.stop(timeout=0)
+
+
+def test_flap_is_merged_and_keeps_the_raise():
+    sink = RecordingSink()
+    sink.publish(event("AGV1", "raised", "t1"))
+    sink.publish(event("AGV2", "raised", "t2"))
+    sink.publish(event("AGV1", "cleared", "t3"))
+    sink.start()
+    try:
+        wait_for(lambda: sink.get_stats()["delivered"] == 2)
+    finally:
+        sink.stop(timeout=1)
+
+    (batch,) = sink.batches
+    assert batch == [
+        dict(event("AGV1", "cleared", "t3"), raised_at="t1", cleared_at="t3", flaps=1),
+        dict(event("AGV2", "raised", "t2"), raised_at="t2", cleared_at=None, flaps=0)
+    ]
+    assert sink.get_stats()["coalesced"] == 1
+
+
+def test_full_buffer_drops_new_events():
+    sink = RecordingSink(max_pending=2)
+    for agv in ["AGV1", "AGV2", "AGV3"]:
+        sink.publish(event(agv, "raised", "t1"))
+
+    stats = sink.get_stats()
+    assert stats["pending"] == 2
+    assert stats["dropped"] == 1
+    assert [e["agv"] for e in sink.pending.values()] == ["AGV1", "AGV2"]
+
+
+def test_exhausted_retries_drop_the_batch():
+    sink = FailingSink(max_retries=2)
+    for agv in ["AGV1", "AGV2", "AGV3"]:
+        sink.publish(event(agv, "raised", "t1"))
+    sink.start()
+    try:
+        wait_for(lambda: sink.get_stats()["failed_batches"] == 1)
+    finally:
+        sink.stop(timeout=1)
+
+    stats = sink.get_stats()
+    assert stats["dropped"] == 3
+    assert stats["retries"] == 2
+    assert stats["delivered"] == 0
+
+
+def test_socket_sink_reconnects_after_peer_closes():
+    server = socket.create_server(("127.0.0.1", 0))
+    received = []
+
+    def accept_one_read_then_close():
+        while True:
+            try:
+                connection, _ = server.accept()
+            except OSError:
+                return
+            with connection:
+                received.append(connection.recv(65536))
+
+    threading.Thread(target=accept_one_read_then_close, daemon=True).start()
+    sink = SocketSink("127.0.0.1", server.getsockname()[1], batch_interval=0.0, backoff=0.01).start()
+    try:
+        sink.publish(event("AGV1", "raised", "t1"))
+        wait_for(lambda: len(received) == 1)
+        time.sleep(0.1)  # Let the close reach the sink's socket
+        sink.publish(event("AGV2", "raised", "t2"))
+        wait_for(lambda: len(received) == 2)
+        wait_for(lambda: sink.get_stats()["delivered"] == 2)
+    finally:
+        sink.stop(timeout=1)
+        server.close()
+
+    assert b'"AGV2"' in received[1]
+    stats = sink.get_stats()
+    assert stats["retries"] == 1
+    assert stats["dropped"] == 0
@@ -0,0 +1,85 @@
+import numpy as np
+
+import streamlit_agv_dashboard_pro as dashboard
+from streamlit_agv_dashboard_pro import HEATMAP_HEADER, HEATMAP_SPEED_MAX, TrafficHeatmap
+
+CELL_A = (-9.9, -9.9)  # Row 0, column 0
+CELL_B = (9.9, 9.9)  # Last row, last column
+
+
+def run_ticks(heatmap, t0, cell, start, ticks, speed=1.0):
+    """One-second ticks at a single cell for t0 + start + 1 .. t0 + start + ticks"""
+    for t in range(start + 1, start + ticks + 1):
+        heatmap.accumulate([cell[0]], [cell[1]], [speed], 1.0, t0 + t)
+
+
+def make_heatmap():
+    heatmap = TrafficHeatmap()
+    return heatmap, heatmap.reference["all"]
+
+
+def test_cumulative_and_decaying_windows():
+    heatmap, t0 = make_heatmap()
+    run_ticks(heatmap, t0, CELL_A, 0, 60)
+    run_ticks(heatmap, t0, CELL_B, 60, 60)
+
+    cumulative, _ = heatmap.snapshot("all", t0 + 120)
+    assert cumulative[0, 0] == 60
+    assert cumulative[-1, -1] == 60
+    assert cumulative.sum() == 120
+
+    recent, _ = heatmap.snapshot("1m", t0 + 120)
+    assert recent[-1, -1] > recent[0, 0] > 0
+    # The older cell has decayed by about e^-1 relative to the newer one
+    assert np.isclose(recent[0, 0] / recent[-1, -1], np.exp(-1.0), rtol=0.05)
+
+
+def test_rebase_preserves_snapshot():
+    heatmap, t0 = make_heatmap()
+    run_ticks(heatmap, t0, CELL_A, 0, 30, speed=2.0)
+    now = t0 + 90
+
+    before = heatmap.snapshot("1m", now)
+    heatmap._rebase("1m", now)
+    after = heatmap.snapshot("1m", now)
+
+    assert heatmap.reference["1m"] == now
+    assert np.allclose(before[0], after[0])
+    assert np.allclose(before[1], after[1])
+
+
+def test_encode_layout_and_speed_scale():
+    heatmap, t0 = make_heatmap()
+    heatmap.accumulate([CELL_A[0], CELL_B[0]], [CELL_A[1], CELL_B[1]],
+                       [HEATMAP_SPEED_MAX * 0.4, HEATMAP_SPEED_MAX * 2], 1.0, t0 + 1)
+
+    payload = heatmap.encode("all", t0 + 1)
+    rows, cols = heatmap.shape
+    assert HEATMAP_HEADER.size == 32
+    assert len(payload) == 32 + 2 * rows * cols
+
+    magic, n_cols, n_rows, *bounds, occ_max, speed_max = HEATMAP_HEADER.unpack(payload[:32])
+    assert magic == b"AGVH"
+    assert (n_cols, n_rows) == (cols, rows)
+    assert tuple(bounds) == heatmap.bounds
+    assert occ_max == 1.0
+    assert np.isclose(speed_max, HEATMAP_SPEED_MAX)
+
+    occupancy = np.frombuffer(payload, dtype=np.uint8, count=rows * cols, offset=32)
+    speed = np.frombuffer(payload, dtype=np.uint8, count=rows * cols, offset=32 + rows * cols)
+    assert occupancy[0] == occupancy[-1] == 255
+    assert speed[0] == round(0.4 * 255)
+    assert speed[-1] == 255  # Clipped at the fixed scale
+    assert speed[1:-1].sum() == 0
+
+
+def test_heatmap_route_rejects_unknown_window():
+    client = dashboard.app.test_client()
+
+    response = client.get("/heatmap?window=bogus")
+    assert response.status_code == 400
+    assert "all" in response.get_json()["windows"]
+
+    response = client.get("/heatmap?window=all")
+    assert response.status_code == 200
+    assert response.mimetype == "application/octet-stream"
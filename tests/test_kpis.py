@@ -0,0 +1,69 @@
+import numpy as np
+
+from streamlit_agv_dashboard_pro import FleetKPIs, SlidingWindowCounter
+
+
+def test_partial_rotation_drops_only_expired_buckets():
+    # Six 10 s buckets; every second in bucket k adds k + 1
+    counter = SlidingWindowCounter(60.0, 1, buckets=6, now=0.0)
+    for t in range(60):
+        counter.add(np.array([t // 10 + 1.0]), float(t))
+    assert counter.sums(59.0)[0] == 210
+
+    # Moving two buckets on expires the first two (10 and 20)
+    assert counter.sums(75.0)[0] == 180
+    counter.add(np.array([5.0]), 75.0)
+    assert counter.sums(79.0)[0] == 185
+
+
+def test_full_expiry_is_exactly_zero():
+    counter = SlidingWindowCounter(60.0, 2, buckets=6, now=0.0)
+    for t in range(600):
+        counter.add(np.array([0.1, 0.3]), t / 10)
+    assert counter.sums(500.0).tolist() == [0.0, 0.0]
+
+
+def test_window_alert_rates_for_fleet_and_agvs():
+    kpis = FleetKPIs(["A", "B"], windows={"1h": 3600.0}, now=0.0)
+    for t in range(1, 7201):
+        onsets = [1 if t % 100 == 0 else 0, 1 if t % 1000 == 0 else 0]
+        kpis.update([0, 3], [1.0, 0.0], onsets, 1.0, float(t))
+
+    report = kpis.report(7200.0)
+    # 60 one-minute buckets: the current one (t = 7200) and 59 full ones
+    # back to t = 3660, so 3541 one-second ticks are covered
+    covered = 3541
+    fleet = report["fleet"]["windows"]["1h"]
+    assert fleet["covered_seconds"] == covered
+    assert fleet["alerts"] == 40
+    assert fleet["alerts_per_hour"] == round(40 * 3600 / covered, 2)
+    assert fleet["distance"] == covered
+
+    agv_a = report["agvs"]["A"]
+    agv_b = report["agvs"]["B"]
+    assert agv_a["alerts"] == 72
+    assert agv_a["windows"]["1h"] == {"alerts": 36, "alerts_per_hour": round(36 * 3600 / covered, 2)}
+    assert agv_b["alerts"] == 7
+    assert agv_b["windows"]["1h"] == {"alerts": 4, "alerts_per_hour": round(4 * 3600 / covered, 2)}
+    assert agv_a["utilization_pct"] == 100.0
+    assert agv_b["utilization_pct"] == 0.0
+    assert report["fleet"]["tracked_seconds"] == 7200
+
+
+def test_sustained_alert_counts_once(fresh_simulation, monkeypatch):
+    sim = fresh_simulation
+    # No movement, no battery drain and no status changes
+    monkeypatch.setattr(sim.random, "uniform", lambda a, b: 0.0)
+    monkeypatch.setattr(sim.random, "random", lambda: 1.0)
+    for agv in sim.agv_data.values():
+        agv["status"] = "idle"
+    sim.agv_data["AGV1"]["battery"] = 10
+
+    for _ in range(20):
+        sim.tick(1.0)
+
+    report = sim.fleet_kpis.report()
+    assert report["agvs"]["AGV1"]["alerts"] == 1
+    assert report["agvs"]["AGV2"]["alerts"] == 0
+    assert report["fleet"]["windows"]["1h"]["alerts"] == 1
+    assert "Low battery" in sim.alert_message